@@ -0,0 +1,104 @@
+import asyncio
+
+import orjson
+from solana.rpc.async_api import GetTransactionResp
+from solders.signature import Signature
+
+from voyager.surfpool_env import SurfpoolEnv
+
+
+def _receipt(err) -> GetTransactionResp:
+    meta = {
+        "err": err,
+        "status": {"Ok": None} if err is None else {"Err": err},
+        "fee": 5000,
+        "preBalances": [1_000_000, 1],
+        "postBalances": [995_000, 1],
+        "innerInstructions": [{"index": 0, "instructions": []}],
+        "logMessages": [],
+        "preTokenBalances": [],
+        "postTokenBalances": [],
+        "rewards": [],
+        "loadedAddresses": {"writable": [], "readonly": []},
+        "computeUnitsConsumed": 150,
+    }
+    raw = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": {
+            "slot": 5,
+            "blockTime": None,
+            "version": "legacy",
+            "transaction": {
+                "signatures": ["1" * 64],
+                "message": {
+                    "header": {
+                        "numRequiredSignatures": 1,
+                        "numReadonlySignedAccounts": 0,
+                        "numReadonlyUnsignedAccounts": 1,
+                    },
+                    "accountKeys": [
+                        "11111111111111111111111111111112",
+                        "11111111111111111111111111111111",
+                    ],
+                    "recentBlockhash": "11111111111111111111111111111111",
+                    "instructions": [
+                        {"programIdIndex": 1, "accounts": [0], "data": "3Bxs4h24hBtQy9rw", "stackHeight": None}
+                    ],
+                },
+            },
+            "meta": meta,
+        },
+    }
+    return GetTransactionResp.from_json(orjson.dumps(raw).decode())
+
+
+def test_decode_receipt_failed_transaction():
+    err = {"InstructionError": [0, {"Custom": 1}]}
+    tx_meta, last_tx_err = SurfpoolEnv()._decode_receipt(_receipt(err))
+    assert last_tx_err == err
+    assert orjson.loads(tx_meta)["meta"]["err"] == err
+
+
+def test_decode_receipt_successful_transaction():
+    _, last_tx_err = SurfpoolEnv()._decode_receipt(_receipt(None))
+    assert last_tx_err is None
+
+
+def test_step_batch_reports_failures_per_transaction():
+    env = SurfpoolEnv()
+    sigs = [str(Signature.new_unique()) for _ in range(3)]
+    receipts = {sigs[0]: _receipt(None), sigs[1]: _receipt(None), sigs[2]: RuntimeError("not found")}
+
+    async def batch_rpc(calls, return_exceptions=False):
+        return sigs
+
+    async def wait_for_confirmation(pending, timeout):
+        raise RuntimeError("status RPC failed")
+
+    async def get_transaction(sig, **kwargs):
+        result = receipts[str(sig)]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get_ordered_instructions(result):
+        if result is receipts[sigs[1]]:
+            raise ValueError("bad instruction data")
+        return SurfpoolEnv._get_ordered_instructions(env, result)
+
+    async def get_observation(**kwargs):
+        return {}
+
+    env._batch_rpc = batch_rpc
+    env._wait_for_confirmation = wait_for_confirmation
+    env.client.get_transaction = get_transaction
+    env._get_ordered_instructions = get_ordered_instructions
+    env._get_observation = get_observation
+
+    _, total, _, _, info = asyncio.run(env.step_batch([b"tx"] * 3))
+
+    ok, bad, missing = info["results"]
+    assert ok["tx_sig"] == sigs[0] and ok["reward"] == total == 1
+    assert bad == {"tx_sig": sigs[1], "error": "bad instruction data"}
+    assert missing == {"tx_sig": sigs[2], "error": "not found"}
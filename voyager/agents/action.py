@@ -13,6 +13,9 @@ from langchain_openai import ChatOpenAI
 from langchain.prompts import SystemMessagePromptTemplate
 from langchain.schema import HumanMessage, AIMessage, SystemMessage
 
+# Fenced code blocks in the model's reply; compiled once rather than on every retry
+CODE_FENCE_PATTERN = re.compile(r"```(?:javascript|js|typescript|ts)(.*?)```", re.DOTALL)
+
 class ActionAgent:
 
     def __init__(
@@ -137,8 +140,7 @@ class ActionAgent:
                 babel = require("@babel/core")
                 babel_generator = require("@babel/generator")
 
-                code_pattern = re.compile(r"```(?:javascript|js|typescript|ts)(.*?)```", re.DOTALL)
-                code = "\n".join(code_pattern.findall(message.content))
+                code = "\n".join(CODE_FENCE_PATTERN.findall(message.content))
                 parsed = babel.parse(code)
                 functions = []
                 assert len(list(parsed.program.body)) > 0, "No functions found"
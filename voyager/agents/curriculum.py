@@ -234,17 +234,12 @@ class CurriculumAgent:
         self.clean_up_tasks()
 
     def clean_up_tasks(self):
-        updated_completed_tasks = []
-        updated_failed_tasks = self.failed_tasks
         # dedup but keep order
-        for task in self.completed_tasks:
-            if task not in updated_completed_tasks:
-                updated_completed_tasks.append(task)
+        updated_completed_tasks = list(dict.fromkeys(self.completed_tasks))
         
         # remove completed tasks from failed tasks
-        for task in updated_completed_tasks:
-            while task in updated_failed_tasks:
-                updated_failed_tasks.remove(task)
+        completed = set(updated_completed_tasks)
+        updated_failed_tasks = [task for task in self.failed_tasks if task not in completed]
 
         self.completed_tasks = updated_completed_tasks
         self.failed_tasks = updated_failed_tasks
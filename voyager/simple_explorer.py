@@ -1,16 +1,16 @@
+import asyncio
 from datetime import datetime
 import json
 import logging
 import os
-import pdb
-import uuid
+import orjson
+import pathlib
 
 
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 from voyager.skill_manager.ts_skill_manager import TypeScriptSkillManager
-from voyager.surfpool_env import SurfpoolEnv
-from voyager.known_programs import KNOWN_PROGRAM_IDS
+from voyager.surfpool_env import SurfpoolEnv, event_loop_factory
 from solders.transaction import Transaction
 import base64
 
@@ -216,8 +216,10 @@ class SimpleExplorer():
         )
 
     def write_trace(self, messages, reward):
-        with open(f"traces/{self.run_id}.json", "w") as f:
-            json.dump(messages, f, indent=2)
+        # The trace is rewritten twice per model call, so serialize it with orjson.
+        # Callers run this via asyncio.to_thread to keep the event loop free.
+        with open(f"traces/{self.run_id}.json", "wb") as f:
+            f.write(orjson.dumps(messages, option=orjson.OPT_INDENT_2))
         with open(f"traces/{self.run_id}_reward.csv", "a") as f:
             f.write(f"{len(self.messages)},{reward}\n")
 
@@ -226,7 +228,7 @@ class SimpleExplorer():
         reward = 0.0
         while finish_reason == "tool_calls":
             # logging.info(f"Messages: {self.messages}")
-            self.write_trace(self.messages, self.reward + reward)
+            await asyncio.to_thread(self.write_trace, self.messages, self.reward + reward)
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=self.messages,
@@ -235,7 +237,7 @@ class SimpleExplorer():
                 tool_choice="auto",
             )
             self.messages.append(response.choices[0].message.model_dump())
-            self.write_trace(self.messages, self.reward + reward)
+            await asyncio.to_thread(self.write_trace, self.messages, self.reward + reward)
             
             done = False
             finish_reason = response.choices[0].finish_reason
@@ -250,7 +252,7 @@ class SimpleExplorer():
                         "name": function_name,
                         "content": ""
                     }
-                    logging.info(f"Function call: {function_name} with args: {function_args}")
+                    logging.info("Function call: %s with args: %s", function_name, function_args)
                     if function_name == "executeSkill":
                         skill_name = function_args["skill_name"]
                         skills = self.skills.get_skills()
@@ -265,11 +267,10 @@ class SimpleExplorer():
                                 # Pass agent pubkey and latest blockhash to skill execution
                                 agent_pubkey = str(self.env.agent_keypair.pubkey())
                                 
-                                # Fetch latest blockhash before skill execution
-                                blockhash_resp = await self.env.client.get_latest_blockhash()
-                                latest_blockhash_str = str(blockhash_resp.value.blockhash)
+                                # Fetch latest blockhash before skill execution; it is reused to sign below
+                                latest_blockhash = await self.env.get_recent_blockhash()
                                 
-                                result = self.skills.execute_skill(skill_file_path, agent_pubkey=agent_pubkey, latest_blockhash=latest_blockhash_str)
+                                result = self.skills.execute_skill(skill_file_path, agent_pubkey=agent_pubkey, latest_blockhash=str(latest_blockhash))
                                 tx_data = result.get("serialized_tx")
                                 if not tx_data:
                                     error_details = {
@@ -284,18 +285,14 @@ class SimpleExplorer():
                                     tx_bytes = base64.b64decode(tx_data)
                                     tx = Transaction.from_bytes(tx_bytes)
                                     
-                                    # Sign with agent keypair
-                                    # Fetch the latest blockhash from surfpool
-                                    blockhash_resp = await self.env.client.get_latest_blockhash()
-                                    latest_blockhash = blockhash_resp.value.blockhash
-                                    
+                                    # Sign with agent keypair, using the blockhash the skill was built with
                                     tx.sign([self.env.agent_keypair], latest_blockhash)
                                     
                                     # Send transaction through surfpool
                                     obs, step_reward, _, _, info = await self.env.step(tx)
                                     reward += step_reward
                                     
-                                    logging.info(f"Step reward: {step_reward}, cumulative step rewards: {reward}, total session reward: {self.reward + reward}")
+                                    logging.info("Step reward: %s, cumulative step rewards: %s, total session reward: %s", step_reward, reward, self.reward + reward)
                                     tool_message["content"] = f"{json.dumps({ 'observation': obs, 'info': info, 'reward': step_reward })}"
                                             
                             except Exception as e:
@@ -312,26 +309,26 @@ class SimpleExplorer():
                         # Save skill file directly
                         skill_dir = f"{self.skills.ckpt_dir}/skill/code"
                         file_path = os.path.join(skill_dir, f"{skill_name}.ts")
-                        with open(file_path, "w") as f:
-                            f.write(skill_code)
+                        # Offload disk writes to a worker thread so they don't block the event loop
+                        await asyncio.to_thread(pathlib.Path(file_path).write_text, skill_code)
                         
                         # Use the add_new_skill method to register it properly
                         skill_info = {
                             'program_name': skill_name,
                             'program_code': skill_code
                         }
-                        self.skills.add_new_skill(skill_info)
+                        await asyncio.to_thread(self.skills.add_new_skill, skill_info)
                         
                         tool_message["content"] = f"Skill {skill_name} written to {file_path}"
                     elif function_name == "readSkills":
                         skills = list(self.skills.get_skills().keys())
                         tool_message["content"] = json.dumps(skills)
-                        logging.info(f"Skills: {skills}")
+                        logging.info("Skills: %s", skills)
                     else:
                         raise ValueError(f"Unexpected function name: {function_name}")
                     self.messages.append(tool_message)
 
-        self.write_trace(self.messages, self.reward + reward)
+        await asyncio.to_thread(self.write_trace, self.messages, self.reward + reward)
         return reward, done
 
     async def rollout(self):
@@ -350,6 +347,10 @@ class SimpleExplorer():
                 break
         return self.reward, False
 
+    async def close(self):
+        self.skills.close()
+        await self.env.close()
+
     async def reset(self):
         observation, info = await self.env.reset()
         self.reward = 0.0
@@ -364,8 +365,6 @@ class SimpleExplorer():
         return observation, info
 
 def run_simple_explorer():
-    import asyncio
-    
     # Load environment variables from .env file
     load_dotenv()
     
@@ -375,10 +374,13 @@ def run_simple_explorer():
     async def main():
         explorer = SimpleExplorer()
         logging.info("Starting rollout")
-        total_reward, _ = await explorer.rollout()
-        logging.info(f"Total reward: {total_reward}")
+        try:
+            total_reward, _ = await explorer.rollout()
+            logging.info(f"Total reward: {total_reward}")
+        finally:
+            await explorer.close()
     
-    asyncio.run(main())
+    asyncio.run(main(), loop_factory=event_loop_factory())
 
 if __name__ == "__main__":
     run_simple_explorer()
\ No newline at end of file
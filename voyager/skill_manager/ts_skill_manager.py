@@ -1,7 +1,7 @@
 import logging
 import pdb
 import subprocess
-import json
+import orjson
 import os
 from typing import Any, Dict, List
 
@@ -14,6 +14,12 @@ from langchain_community.vectorstores import Chroma
 from langchain_openai import OpenAIEmbeddings
 from langchain.schema import SystemMessage, HumanMessage
 
+# Error runSkillServer.ts reports when executeSkill() outlives its timeout
+SKILL_TIMEOUT_ERROR = "Skill execution timed out."
+# Every rewritten skill is imported under a fresh URL and bun never evicts the old
+# module, so restart the server after this many executions to bound its memory
+SKILL_WORKER_MAX_EXECUTIONS = 200
+
 class TypeScriptSkillManager:
     def __init__(
         self, 
@@ -44,6 +50,13 @@ class TypeScriptSkillManager:
             self.skills = {}
         self.retrieval_top_k = retrieval_top_k
         self.ckpt_dir = ckpt_dir
+        # Rebuilt lazily by get_skill_docs(); reset to None whenever skills change
+        self._docs_cache = None
+        # Persistent bun process serving execute_skill(); started on first use
+        self._skill_worker = None
+        self._skill_responses = None    # read end of the worker's response pipe
+        self._skill_request_id = 0
+        self._skill_worker_executions = 0   # requests answered by the current worker
         embeddings = OpenAIEmbeddings()
         self.vectordb = Chroma(
             collection_name="skill_vectordb",
@@ -84,14 +97,20 @@ class TypeScriptSkillManager:
         # todo(ngundotra): if task is for primitive, skip
         program_name = info['program_name']
         program_code = info['program_code']
+        if self.skills.get(program_name, {}).get("code") == program_code:
+            # Re-registering identical code: keep the stored description and files
+            # instead of paying for another LLM description and a new version file
+            logging.info(f"\033[33mSkill {program_name} is unchanged; skipping re-registration\033[0m")
+            return
         skill_description = self.generate_skill_description(program_name, program_code)
         logging.info(
             f"\033[33mSkill Manager generated description for {program_name}:\n{skill_description}\033[0m"
         )
         if program_name in self.skills:
             self.vectordb._collection.delete(ids=[program_name])
+            existing_files = set(os.listdir(f"{self.ckpt_dir}/skill/code"))
             i = 2
-            while f"{program_name}V{i}.ts" in os.listdir(f"{self.ckpt_dir}/skill/code"):
+            while f"{program_name}V{i}.ts" in existing_files:
                 i += 1
             dumped_program_name = f"{program_name}V{i}"
         else:
@@ -105,6 +124,7 @@ class TypeScriptSkillManager:
             "code": program_code,
             "description": skill_description,
         }
+        self._docs_cache = None
         assert self.vectordb._collection.count() == len(
             self.skills
         ), "vectordb is not synced with skills.json"
@@ -185,7 +205,7 @@ class TypeScriptSkillManager:
             )
             return {
                 'success': True,
-                'serialized_tx': json.loads(result.stdout.strip("\n"))["serialized_tx"],
+                'serialized_tx': orjson.loads(result.stdout.strip("\n"))["serialized_tx"],
                 'stdout': result.stdout.strip("\n"),
                 'stderr': result.stderr.strip("\n"),
             }
@@ -193,7 +213,7 @@ class TypeScriptSkillManager:
             # Try to parse JSON error from stdout first (where runCode.ts outputs errors)
             if e.stdout:
                 try:
-                    error_json = json.loads(e.stdout.strip("\n"))
+                    error_json = orjson.loads(e.stdout.strip("\n"))
                     return {
                         "success": False,
                         "reason": error_json.get("error", "Unknown error"),
@@ -201,7 +221,7 @@ class TypeScriptSkillManager:
                         'stdout': e.stdout.strip("\n") if e.stdout else "",
                         'stderr': e.stderr.strip("\n") if e.stderr else "",
                     }
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     pass
             
             # Fallback to stderr
@@ -234,6 +254,7 @@ class TypeScriptSkillManager:
         with open(file_path, "w") as f:
             f.write(code)
         self.skills[skill_name] = file_path
+        self._docs_cache = None
         self.next_skill_id += 1
         return skill_name
 
@@ -243,7 +264,9 @@ class TypeScriptSkillManager:
     def get_skill_docs(self) -> Dict[str, str]:
         # For TypeScript skills, we might not have docstrings in the same way as Python.
         # For now, return the file paths as "docs".
-        return {str(k): v for k, v in self.skills.items()}
+        if self._docs_cache is None:
+            self._docs_cache = {str(k): v for k, v in self.skills.items()}
+        return self._docs_cache
 
     def save_skill(self, name: str, code: str) -> str:
         file_path = os.path.join(self.skills_dir, f"{name}.ts")
@@ -251,34 +274,97 @@ class TypeScriptSkillManager:
             f.write(code)
         return file_path
 
+    def _get_skill_worker(self) -> subprocess.Popen:
+        """Returns the long-lived bun skill server, (re)starting it if needed."""
+        if self._skill_worker is None or self._skill_worker.poll() is not None:
+            self._kill_skill_worker()
+            # Responses come back on a dedicated pipe; the worker's stdout is sent to
+            # our stderr so whatever a skill prints can never be mistaken for one
+            read_fd, write_fd = os.pipe()
+            try:
+                self._skill_worker = subprocess.Popen(
+                    ["bun", "voyager/skill_runner/runSkillServer.ts", str(write_fd)],
+                    stdin=subprocess.PIPE,
+                    stdout=2,  # our stderr
+                    pass_fds=(write_fd,),
+                    text=True,
+                    encoding='utf-8',
+                    bufsize=1,
+                )
+            except BaseException:
+                os.close(read_fd)
+                raise
+            finally:
+                os.close(write_fd)
+            self._skill_responses = os.fdopen(read_fd, "r", encoding="utf-8")
+            self._skill_worker_executions = 0
+        return self._skill_worker
+
+    def _kill_skill_worker(self):
+        """Tears down the skill server so the next call starts a fresh one."""
+        if self._skill_worker is not None:
+            self._skill_worker.kill()
+            self._skill_worker.wait()
+            try:
+                self._skill_worker.stdin.close()
+            except OSError:
+                pass    # unflushed request to a dead worker
+            self._skill_worker = None
+        if self._skill_responses is not None:
+            self._skill_responses.close()
+            self._skill_responses = None
+
     def execute_skill(self, file_path: str, timeout_ms: int = 10000, agent_pubkey: str = None, latest_blockhash: str = None) -> Dict[str, Any]:
-        command = ["bun", "voyager/skill_runner/runSkill.ts", file_path, str(timeout_ms)]
+        self._skill_request_id += 1
+        request_id = self._skill_request_id
+        request = {"id": request_id, "file_path": file_path, "timeout_ms": timeout_ms}
         if agent_pubkey:
-            command.append(agent_pubkey)
+            request["agent_pubkey"] = agent_pubkey
         if latest_blockhash:
-            command.append(latest_blockhash)
+            request["latest_blockhash"] = latest_blockhash
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                check=True,
-                encoding='utf-8'
-            )
-            # runSkill.ts now outputs a JSON object with tx_receipt_json_string
-            return json.loads(result.stdout.strip("\n"))
-        except subprocess.CalledProcessError as e:
-            # pdb.set_trace()
-            # If runSkill.ts exits with an error, it prints the JSON result to stderr
-            try:
-                # The error output might also be a JSON object if the skill itself failed gracefully
-                return json.loads(e.stderr.strip("\n"))
-            except json.JSONDecodeError:
-                # Fallback for unexpected stderr output
-                return {"success": False, "reason": f"Skill runner error: {e.stderr}"}
+            worker = self._get_skill_worker()
+            worker.stdin.write(orjson.dumps(request).decode() + "\n")
+            worker.stdin.flush()
+            response = self._skill_responses.readline()
         except FileNotFoundError:
             return {"success": False, "reason": "Bun command not found. Make sure Bun is installed and in your PATH."}
+        except OSError as e:
+            self._kill_skill_worker()
+            return {"success": False, "reason": f"Skill runner error: {e}"}
+        if not response:
+            # The server exited mid-request; it is restarted on the next call
+            self._kill_skill_worker()
+            return {"success": False, "reason": "Skill runner exited unexpectedly"}
+        # runSkillServer.ts writes exactly one JSON object per request, echoing its id.
+        # Anything else means the stream is out of sync, so start over with a new worker.
+        try:
+            result = orjson.loads(response)
+        except orjson.JSONDecodeError:
+            result = None
+        if not isinstance(result, dict) or result.pop("id", None) != request_id:
+            self._kill_skill_worker()
+            return {"success": False, "reason": f"Skill runner protocol error: unexpected response {response[:200]!r}"}
+        if result.get("error") == SKILL_TIMEOUT_ERROR:
+            # The server exits after a timeout so the runaway skill dies with it; reap it
+            # now rather than racing its exit on the next request
+            self._kill_skill_worker()
+        else:
+            self._skill_worker_executions += 1
+            if self._skill_worker_executions >= SKILL_WORKER_MAX_EXECUTIONS:
+                self.close()
+        return result
 
+    def close(self, timeout: float = 5.0):
+        """Shuts down the skill server, killing it if it has not exited within `timeout` seconds."""
+        if self._skill_worker is not None:
+            try:
+                # EOF on stdin ends the server's request loop
+                self._skill_worker.stdin.close()
+                self._skill_worker.wait(timeout=timeout)
+            except (OSError, subprocess.TimeoutExpired):
+                pass    # stuck in a busy skill or already gone; killed below
+        self._kill_skill_worker()
 
 if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO)
@@ -0,0 +1,115 @@
+import fs from 'fs';
+import path from 'path';
+
+// Long-lived counterpart to runSkill.ts. Instead of paying for a fresh bun
+// startup (and re-loading @solana/web3.js) on every skill execution, the
+// Python TypeScriptSkillManager keeps one of these processes alive and talks
+// to it over a line-delimited JSON protocol:
+//
+//   stdin:       {"id": 1, "file_path": "...", "timeout_ms": 10000}
+//   response fd: {"id": 1, "serialized_tx": "..."} or {"id": 1, "serialized_tx": null, "error": "...", "trace": "..."}
+//
+// Exactly one response line is written per request line, echoing its id.
+// After a timeout response the server exits, taking the runaway skill with it.
+// Each rewritten skill is imported under a new ?v= URL and bun never evicts the
+// old module, so the Python side recycles the server every
+// SKILL_WORKER_MAX_EXECUTIONS requests to keep its memory bounded.
+// Responses go to the fd given as the first argument (stdout if omitted) so
+// that nothing a skill prints - including a timed-out skill still running in
+// this process - can land in the protocol stream.
+
+// Define the expected return type from executeSkill in TS skills
+type SkillExecutionResult = string;
+
+type SkillResponse = {
+    serialized_tx: SkillExecutionResult | null;
+    error?: string;
+    trace?: string;
+};
+
+type SkillRequest = {
+    id?: number;
+    file_path: string;
+    timeout_ms?: number;
+};
+
+const DEFAULT_TIMEOUT_MS = 10000;
+// Kept in sync with SKILL_TIMEOUT_ERROR in ts_skill_manager.py
+const TIMEOUT_ERROR = 'Skill execution timed out.';
+// fd the Python side reads responses from; falls back to stdout when run by hand.
+const RESPONSE_FD = process.argv[2] !== undefined ? Number(process.argv[2]) : undefined;
+
+// Resolves once the response has been handed to the OS, so it is safe to exit afterwards.
+const writeResponse = (response: object): Promise<void> => {
+    const line = JSON.stringify(response) + "\n";
+    if (RESPONSE_FD === undefined) {
+        return new Promise((resolve) => process.stdout.write(line, () => resolve()));
+    }
+    const data = Buffer.from(line);
+    for (let offset = 0; offset < data.length;) {
+        offset += fs.writeSync(RESPONSE_FD, data, offset);
+    }
+    return Promise.resolve();
+};
+// Route anything a skill logs through console to stderr.
+for (const method of ['log', 'info', 'debug', 'dir', 'table'] as const) {
+    console[method] = (...args: unknown[]) => console.error(...args);
+}
+
+async function runSkill(request: SkillRequest): Promise<SkillResponse> {
+    const timeoutMs = request.timeout_ms ?? DEFAULT_TIMEOUT_MS;
+    const absolutePath = path.resolve(request.file_path);
+
+    try {
+        // Skills are re-written under the same name, so bust bun's module cache by mtime.
+        const mtime = (await Bun.file(absolutePath).stat()).mtimeMs;
+        const skillModule = await import(`${absolutePath}?v=${mtime}`);
+
+        if (typeof skillModule.executeSkill !== 'function') {
+            throw new Error('executeSkill function not found in the provided module.');
+        }
+
+        let timer: ReturnType<typeof setTimeout> | undefined;
+        const serialized_tx: SkillExecutionResult = await Promise.race([
+            skillModule.executeSkill(),
+            new Promise<SkillExecutionResult>((_, reject) => {
+                timer = setTimeout(() => reject(new Error(TIMEOUT_ERROR)), timeoutMs);
+            }),
+        ]).finally(() => clearTimeout(timer));
+
+        return { serialized_tx };
+    } catch (error) {
+        const reason = error instanceof Error ? error.message : 'An unknown error occurred.';
+        return {
+            serialized_tx: null,
+            error: reason,
+            trace: error instanceof Error && error.stack ? error.stack : (error?.toString?.() ?? String(error))
+        };
+    }
+}
+
+async function serve(): Promise<void> {
+    // Requests are handled one at a time; the parent blocks on each response.
+    for await (const line of console) {
+        if (!line.trim()) {
+            continue;
+        }
+        let request: SkillRequest;
+        try {
+            request = JSON.parse(line);
+        } catch (error) {
+            await writeResponse({ id: null, serialized_tx: null, error: `Invalid request: ${line}`, trace: "" });
+            continue;
+        }
+        const response = await runSkill(request);
+        await writeResponse({ id: request.id ?? null, ...response });
+        if (response.error === TIMEOUT_ERROR) {
+            // The timed-out executeSkill() is still running, along with its timers and
+            // network calls. Exit so it dies with the process, as it would under runSkill.ts;
+            // the Python side starts a fresh server for the next request.
+            process.exit(1);
+        }
+    }
+}
+
+serve();
@@ -0,0 +1,96 @@
+import { describe, test, expect, afterAll } from "bun:test";
+import * as path from "path";
+import * as fs from "fs";
+
+const testSkillsDir = path.join(__dirname, "test_skills_server");
+const serverPath = path.join(__dirname, "..", "runSkillServer.ts");
+
+if (!fs.existsSync(testSkillsDir)) {
+    fs.mkdirSync(testSkillsDir, { recursive: true });
+}
+
+const writeSkill = (name: string, body: string) => {
+    const skillPath = path.join(testSkillsDir, name);
+    fs.writeFileSync(skillPath, body);
+    return skillPath;
+};
+
+describe("Skill Server", () => {
+    test("answers one JSON line per request from a single process", async () => {
+        const okSkill = writeSkill("ok.ts", `
+export async function executeSkill(): Promise<string> {
+    console.log("this must not reach stdout");
+    console.info("nor this");
+    return "c2VyaWFsaXplZA==";
+}
+`);
+        const failSkill = writeSkill("fail.ts", `
+export async function executeSkill(): Promise<string> {
+    throw new Error("This skill is designed to fail.");
+}
+`);
+
+        const proc = Bun.spawn(["bun", serverPath], { stdin: "pipe", stdout: "pipe", stderr: "ignore" });
+        proc.stdin.write(JSON.stringify({ id: 1, file_path: okSkill, timeout_ms: 5000 }) + "\n");
+        proc.stdin.write(JSON.stringify({ id: 2, file_path: failSkill, timeout_ms: 5000 }) + "\n");
+        proc.stdin.end();
+
+        const lines = (await new Response(proc.stdout).text()).trim().split("\n");
+        expect(lines.length).toBe(2);
+
+        const ok = JSON.parse(lines[0]);
+        expect(ok.id).toBe(1);
+        expect(ok.serialized_tx).toBe("c2VyaWFsaXplZA==");
+
+        const failed = JSON.parse(lines[1]);
+        expect(failed.id).toBe(2);
+        expect(failed.serialized_tx).toBeNull();
+        expect(failed.error).toBe("This skill is designed to fail.");
+    }, 15000);
+
+    test("exits after a timeout so the runaway skill dies with it", async () => {
+        const marker = path.join(testSkillsDir, "leaked.txt");
+        const slowSkill = writeSkill("slow.ts", `
+import * as fs from "fs";
+export async function executeSkill(): Promise<string> {
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+    fs.writeFileSync(${JSON.stringify(marker)}, "still running");
+    return "c2xvdw==";
+}
+`);
+        const okSkill = writeSkill("ok_after_timeout.ts", `
+export async function executeSkill(): Promise<string> {
+    return "b2s=";
+}
+`);
+
+        const proc = Bun.spawn(["bun", serverPath], { stdin: "pipe", stdout: "pipe", stderr: "ignore" });
+        proc.stdin.write(JSON.stringify({ id: 1, file_path: slowSkill, timeout_ms: 100 }) + "\n");
+        proc.stdin.write(JSON.stringify({ id: 2, file_path: okSkill, timeout_ms: 5000 }) + "\n");
+        proc.stdin.end();
+
+        // Only the timeout is answered; the queued request dies with the process
+        const lines = (await new Response(proc.stdout).text()).trim().split("\n");
+        expect(lines.length).toBe(1);
+        const timedOut = JSON.parse(lines[0]);
+        expect(timedOut.id).toBe(1);
+        expect(timedOut.serialized_tx).toBeNull();
+        expect(timedOut.error).toBe("Skill execution timed out.");
+        expect(await proc.exited).toBe(1);
+
+        await Bun.sleep(1500);
+        expect(fs.existsSync(marker)).toBe(false);
+
+        // A fresh server (what the Python side starts next) serves the second request
+        const next = Bun.spawn(["bun", serverPath], { stdin: "pipe", stdout: "pipe", stderr: "ignore" });
+        next.stdin.write(JSON.stringify({ id: 2, file_path: okSkill, timeout_ms: 5000 }) + "\n");
+        next.stdin.end();
+        const ok = JSON.parse((await new Response(next.stdout).text()).trim());
+        expect(ok.id).toBe(2);
+        expect(ok.serialized_tx).toBe("b2s=");
+    }, 15000);
+});
+
+afterAll(() => {
+    fs.rmSync(testSkillsDir, { recursive: true, force: true });
+});
@@ -1,20 +1,22 @@
 import base64
-import pdb
 import base58
 import gymnasium as gym
-import numpy as np
 import asyncio
 from contextlib import asynccontextmanager
 import logging
-import json
+import orjson
 import shutil
 import os
 import signal
+import time
+from typing import TYPE_CHECKING
+import httpx
 from dotenv import load_dotenv
 from os.path import dirname, join
 
 from solana.rpc.async_api import AsyncClient, GetTransactionResp
-from solders.transaction import Transaction
+from solana.rpc.commitment import Processed
+from solana.rpc.types import TxOpts
 from solders.keypair import Keypair
 from solders.transaction import VersionedTransaction
 from solders.system_program import transfer, TransferParams, create_nonce_account
@@ -22,13 +24,67 @@ from solders.message import MessageV0, to_bytes_versioned
 from solders.pubkey import Pubkey
 from solders.null_signer import NullSigner
 from solders.signature import Signature
+from solders.transaction_status import TransactionConfirmationStatus
 
 from voyager.known_programs import KNOWN_PROGRAM_IDS
-from voyager.skill_manager.ts_skill_manager import TypeScriptSkillManager
+if TYPE_CHECKING:
+    # Annotation only; importing it pulls in langchain and chromadb
+    from voyager.skill_manager.ts_skill_manager import TypeScriptSkillManager
 
 load_dotenv(join(dirname(__file__), '.env'))
 
 READY_TOKEN = b"Connection established."          # surfpool prints this when ready
+LOCAL_RPC_URL = "http://127.0.0.1:8899"            # where surfpool serves JSON-RPC
+
+# Small integer codes for the common Solana TransactionError variants, so
+# policies can branch on `last_tx_error_code` without parsing error strings.
+TX_ERROR_CODES = {
+    None: 0,
+    "InstructionError": 1,
+    "InsufficientFundsForFee": 2,
+    "InsufficientFundsForRent": 3,
+    "AccountNotFound": 4,
+    "ProgramAccountNotFound": 5,
+    "BlockhashNotFound": 6,
+    "AlreadyProcessed": 7,
+    "AccountInUse": 8,
+    "InvalidAccountForFee": 9,
+    "SignatureFailure": 10,
+    "InvalidProgramForExecution": 11,
+    "WouldExceedMaxAccountCostLimit": 12,
+}
+TX_ERROR_CODE_OTHER = 255
+
+# Expected failures (bad transactions from exploring agents) log a full
+# traceback at most this often; formatting one per failed step adds up
+TRACEBACK_LOG_INTERVAL = 1.0
+
+_CONFIRMED_STATUSES = (TransactionConfirmationStatus.Confirmed, TransactionConfirmationStatus.Finalized)
+
+# Sentinel for _get_observation: no transaction preceded this observation
+_NO_TX = object()
+
+
+def _tx_error_code(err) -> int:
+    """Maps a JSON-decoded TransactionError (`"Variant"` or `{"Variant": ...}`) to its code."""
+    if err is None:
+        return TX_ERROR_CODES[None]
+    tag = err if isinstance(err, str) else next(iter(err), None)
+    return TX_ERROR_CODES.get(tag, TX_ERROR_CODE_OTHER)
+
+async def _drain_output(proc: asyncio.subprocess.Process):
+    """Forwards surfpool's output to the debug log until the pipe closes."""
+    while line := await proc.stdout.readline():
+        logging.debug("[surfpool] %s", line.decode(errors="replace").rstrip())
+
+def event_loop_factory():
+    """Returns uvloop's loop factory where it is installed (not on Windows), else None for asyncio's default."""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
 # ──────────────────────────────────────────────────────────────────────────
 #  Async context-manager that owns the Surfpool process life-cycle
 # ──────────────────────────────────────────────────────────────────────────
@@ -58,10 +114,15 @@ async def _surfpool_validator(rpc_url: str, *, backtrace: bool = True):
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.STDOUT,
         start_new_session=True,        # own pgid → easy to kill
+        # fds are non-inheritable by default (PEP 446), so skip the close-all-fds
+        # pass; with no preexec_fn CPython spawns via vfork and avoids copying
+        # the parent's page tables
+        close_fds=False,
         env=env,
     )
     logging.info("surfpool [%s] launched", proc.pid)
 
+    drain_task = None
     try:
         # Block until Surfpool is actually serving RPC or abort early
         while True:
@@ -71,6 +132,9 @@ async def _surfpool_validator(rpc_url: str, *, backtrace: bool = True):
             logging.debug("[surfpool] %s", line.decode().rstrip())
             if READY_TOKEN in line:
                 break
+        # Keep draining the log pipe; if nobody reads it, surfpool blocks on
+        # write once the OS pipe buffer fills up
+        drain_task = asyncio.create_task(_drain_output(proc))
         yield proc                             # ── control goes back to caller
     finally:
         if proc.returncode is None:
@@ -84,7 +148,10 @@ async def _surfpool_validator(rpc_url: str, *, backtrace: bool = True):
                 await proc.wait()
             except ProcessLookupError as e:
                 logging.warning("surfpool process already terminated")
-                
+        # Cancel only after exit so shutdown logging can't fill the pipe
+        if drain_task is not None:
+            drain_task.cancel()
+
         logging.info("surfpool shut down")
 
 class SurfpoolEnv(gym.Env):
@@ -97,67 +164,136 @@ class SurfpoolEnv(gym.Env):
     """
     metadata = {"render_modes": ["human"], "render_fps": 30}
 
-    def __init__(self, rpc_url: str = "https://api.mainnet-beta.solana.com", ws_url: str = "ws://localhost:8900"):
+    def __init__(self, rpc_url: str = "https://api.mainnet-beta.solana.com", ws_url: str = "ws://localhost:8900",
+                 skip_preflight: bool = False):
         super().__init__()
 
         self.rpc_url = rpc_url
         self.ws_url = ws_url
+        # Skipping the preflight simulation saves surfpool a simulate per step, but
+        # failures then land on-chain (or, for a bad blockhash, never land and time out)
+        # instead of being rejected up front with the simulation logs
+        self.skip_preflight = skip_preflight
         # The client for the Voyager environment will connect to the surfpool instance
-        self.client = AsyncClient("http://127.0.0.1:8899", "confirmed")
+        self.local_rpc_url = LOCAL_RPC_URL
+        self.client = AsyncClient(self.local_rpc_url, "confirmed")
+        # Shared keep-alive pool for raw JSON-RPC requests (see _batch_rpc)
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+            timeout=30,
+        )
         self.test_validator_process = None
-        self.agent_keypair = Keypair()
+        self._set_agent_keypair(Keypair())
 
         self.tx_fetch_rpc_url = os.getenv("SOLANA_TX_FETCH_RPC_URL", "https://api.mainnet-beta.solana.com")
         self.tx_fetch_client = AsyncClient(self.tx_fetch_rpc_url)
 
         self.program_instructions_seen = {}
+        self._discovered_programs = {}  # program id str -> None, kept in discovery order
         self.last_observation = None
         self.last_tx_receipt = None
+        self._cached_blockhash = None   # (Hash, time.monotonic() when fetched)
+        self._last_chain_state = None   # (block_height, sol_balance) from the last observation RPC
+        self._last_traceback_logged = float("-inf")  # time.monotonic() of the last sampled traceback
+        self._blockhash_lock = asyncio.Lock()
         self._validator_cm = None       # will hold the context-manager
         self._validator_proc = None     # the running subprocess
         self.total_reward = 0           # Track cumulative reward for this episode.Process
 
 
-    async def _get_observation(self, last_tx_result=None):
+    def _set_agent_keypair(self, keypair: Keypair):
+        """Swaps in a new agent keypair and caches its pubkey forms for the hot path."""
+        self.agent_keypair = keypair
+        self._agent_pubkey = keypair.pubkey()
+        self._agent_pubkey_str = str(self._agent_pubkey)
+
+    def _log_expected_error(self, msg: str):
+        """Logs `msg` at error level, attaching the current traceback at most once per TRACEBACK_LOG_INTERVAL."""
+        now = time.monotonic()
+        with_traceback = now - self._last_traceback_logged >= TRACEBACK_LOG_INTERVAL
+        if with_traceback:
+            self._last_traceback_logged = now
+        logging.error(msg, exc_info=with_traceback)
+
+    async def _get_observation(self, last_tx_err=_NO_TX, refresh_chain=True):
         # In a real implementation, you would fetch this data from the chain
-        # Get unique programs from the instructions seen
-        unique_programs = {str(k[0]) for k in self.program_instructions_seen.keys()}
-        
+        # refresh_chain=False reuses the last fetched block height and balance; only
+        # valid when nothing has been sent on-chain since (e.g. a rejected transaction)
+        # Unique programs are tracked incrementally in _get_reward
         obs = {
             "sol_balance": 0,
-            "agent_pubkey": str(self.agent_keypair.pubkey()),
+            "agent_pubkey": self._agent_pubkey_str,
             "block_height": 0,
-            "discovered_programs": len(unique_programs),
-            "discovered_program_list": list(unique_programs),  # Unique program IDs
+            "discovered_programs": len(self._discovered_programs),
+            "discovered_program_list": list(self._discovered_programs),  # Unique program IDs
             "total_reward": self.total_reward,
             "unique_instructions_found": len(self.program_instructions_seen)
         }
 
-        try:
-            # Get basic block info
-            block_height = await self.client.get_block_height()
-            obs["block_height"] = block_height.value
-            
-            # Get agent SOL balance (as the first token)
-            balance = await self.client.get_balance(self.agent_keypair.pubkey())
-            obs["sol_balance"] = balance.value / 1e9 # Convert lamports to SOL
-
-            # TODO: Get other token balances
-
-        except Exception as e:
-            logging.error(f"Error getting observation: {e}", exc_info=True)
-
-        if last_tx_result:
-            # The receipt is a JSON string, so we need to parse it
-            receipt_dict = json.loads(last_tx_result)
-            if receipt_dict.get("meta", {}).get("err") is None:
+        if not refresh_chain and self._last_chain_state is not None:
+            obs["block_height"], obs["sol_balance"] = self._last_chain_state
+        else:
+            try:
+                # Fetch block info and the agent's SOL balance in a single round trip
+                block_height, balance = await self._batch_rpc([
+                    ("getBlockHeight", [{"commitment": "confirmed"}]),
+                    ("getBalance", [self._agent_pubkey_str, {"commitment": "confirmed"}]),
+                ])
+                obs["block_height"] = block_height
+                obs["sol_balance"] = balance["value"] / 1e9 # Convert lamports to SOL
+                self._last_chain_state = (obs["block_height"], obs["sol_balance"])
+
+                # TODO: Get other token balances
+
+            except Exception as e:
+                self._log_expected_error(f"Error getting observation: {e}")
+
+        if last_tx_err is not _NO_TX:
+            # last_tx_err is the JSON-decoded meta.err of the last transaction
+            obs["last_tx_error_code"] = _tx_error_code(last_tx_err)
+            if last_tx_err is None:
                 obs["last_tx_success"] = 1
             else:
                 obs["last_tx_success"] = 0
-                obs["last_tx_error"] = str(receipt_dict.get("meta", {}).get("err"))
+                # LLM agents read the observation as text, so keep the readable form too
+                obs["last_tx_error"] = str(last_tx_err)
 
         return [["observe", obs]]
 
+    async def _batch_rpc(self, calls: list[tuple[str, list]], return_exceptions: bool = False) -> list:
+        """
+        Sends several JSON-RPC calls to the local validator as one batch request.
+
+        Args:
+            calls: (method, params) pairs, e.g. ("getBalance", [pubkey])
+            return_exceptions: like asyncio.gather, put a RuntimeError in place of a failed
+                call's result instead of raising it
+
+        Returns:
+            The `result` of each call, in the same order as `calls`
+        """
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        resp = await self._http.post(
+            self.local_rpc_url,
+            content=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
+        resp.raise_for_status()
+        # Batch responses may come back in any order; match them up by id
+        results = [None] * len(calls)
+        for item in orjson.loads(resp.content):
+            if "error" in item:
+                error = RuntimeError(f"RPC {calls[item['id']][0]} failed: {item['error']}")
+                if not return_exceptions:
+                    raise error
+                results[item["id"]] = error
+            else:
+                results[item["id"]] = item["result"]
+        return results
+
     def _partial_sign_transaction(self, tx_bytes: bytes, additional_signers: list[Keypair]) -> VersionedTransaction:
         """
         Add additional signatures to a VersionedTransaction without overwriting existing ones.
@@ -186,29 +322,55 @@ class SurfpoolEnv(gym.Env):
         tx.signatures = sigs
         return tx
 
-    async def reset(self, seed=None, options=None):
-        super().reset(seed=seed)
-        
+    async def _hard_reset(self):
+        """Stops the running surfpool (if any) and launches a fresh one."""
         try:
             if self._validator_cm:
                 await self._validator_cm.__aexit__(None, None, None)
         except Exception as e:
             logging.error(f"Error closing validator: {e}", exc_info=True)
+        self._validator_cm = self._validator_proc = None
 
-        # 2. Launch a fresh validator and wait until it’s live
+        # Launch a fresh validator and wait until it’s live
         self._validator_cm = _surfpool_validator(self.rpc_url)
         self._validator_proc = await self._validator_cm.__aenter__()
 
+    def _validator_alive(self) -> bool:
+        return self._validator_proc is not None and self._validator_proc.returncode is None
+
+    async def reset(self, seed=None, options=None):
+        """
+        Starts a new episode with a freshly funded agent keypair.
+
+        Restarting surfpool takes seconds, so the running validator is reused unless it
+        has died or `options={"hard_reset": True}` is passed. On a soft reset, on-chain
+        state left by earlier episodes persists; only the agent and reward tracking are new.
+        """
+        super().reset(seed=seed)
+
+        if (options and options.get("hard_reset")) or not self._validator_alive():
+            await self._hard_reset()
+        else:
+            logging.info("Reusing running surfpool [%s]", self._validator_proc.pid)
+
         # Create a new agent for the episode
-        self.agent_keypair = Keypair()
+        self._set_agent_keypair(Keypair())
+        self._last_chain_state = None
         self.program_instructions_seen = {}
+        self._discovered_programs = {}
         self.total_reward = 0
         
         # Fund the agent
         try:
-            logging.info(f"Airdropping SOL to {self.agent_keypair.pubkey()}...")
-            airdrop_sig = await self.client.request_airdrop(self.agent_keypair.pubkey(), 2 * 10**9) # 2 SOL
-            await self.client.confirm_transaction(airdrop_sig.value, "confirmed", 30.0)
+            logging.info(f"Airdropping SOL to {self._agent_pubkey_str}...")
+            airdrop_sig = await self.client.request_airdrop(self._agent_pubkey, 2 * 10**9) # 2 SOL
+            # Warm the blockhash cache while the airdrop confirms. The observation
+            # is not overlapped: it has to see the funded balance.
+            self._cached_blockhash = None
+            await asyncio.gather(
+                self._wait_for_confirmation([airdrop_sig.value], 30.0),
+                self._prefetch_blockhash(),
+            )
             logging.info("Airdrop successful.")
         except Exception as e:
             logging.error(f"Airdrop failed: {e}", exc_info=True)
@@ -220,14 +382,65 @@ class SurfpoolEnv(gym.Env):
         return observation, info
 
 
-    async def step2(self, code: str, programs: list[str], skill_manager: TypeScriptSkillManager):
+    async def _prefetch_blockhash(self):
+        """Fetches the latest blockhash into the cache; failures are only logged."""
+        try:
+            resp = await self.client.get_latest_blockhash()
+            self._cached_blockhash = (resp.value.blockhash, time.monotonic())
+        except Exception as e:
+            logging.warning(f"Blockhash prefetch failed: {e}")
+
+    async def get_recent_blockhash(self, max_age: float = 20.0):
+        """
+        Returns a recent blockhash, reusing the cached one if it is younger than `max_age` seconds.
+
+        Blockhashes stay valid for ~60-90s, so a short-lived cache saves an RPC round trip
+        per transaction. step() and step_batch() drop the cache whenever they send, so a
+        hash is never handed out again after a transaction signed with it went out: a
+        deterministic skill re-run would otherwise produce a byte-identical transaction,
+        which surfpool rejects as AlreadyProcessed.
+        """
+        async with self._blockhash_lock:
+            cached = self._cached_blockhash
+            if cached is None or time.monotonic() - cached[1] > max_age:
+                resp = await self.client.get_latest_blockhash()
+                cached = self._cached_blockhash = (resp.value.blockhash, time.monotonic())
+            return cached[0]
+
+    async def _wait_for_confirmation(self, sigs: list[Signature], timeout: float, poll_interval: float = 0.02):
+        """
+        Polls getSignatureStatuses until every signature in `sigs` reaches confirmed commitment.
+
+        Surfpool confirms in milliseconds, so a tight poll returns far sooner than
+        AsyncClient.confirm_transaction, which sleeps 0.5s between checks.
+
+        Returns:
+            The confirmed TransactionStatus of each signature, in the same order as `sigs`
+        """
+        confirmed = {}
+        pending = list(sigs)
+        deadline = time.monotonic() + timeout
+        while pending:
+            statuses = (await self.client.get_signature_statuses(pending)).value
+            for sig, status in zip(pending, statuses):
+                if status is not None and status.confirmation_status in _CONFIRMED_STATUSES:
+                    confirmed[sig] = status
+            pending = [sig for sig in pending if sig not in confirmed]
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Transaction {pending[0]} not confirmed after {timeout}s")
+            await asyncio.sleep(poll_interval)
+        return [confirmed[sig] for sig in sigs]
+
+    async def step2(self, code: str, programs: list[str], skill_manager: "TypeScriptSkillManager"):
         """
         Workaround to make it easy to call step()
         """
         result = skill_manager.evaluate_code(
             code,
             programs,
-            str(self.agent_keypair.pubkey()),
+            self._agent_pubkey_str,
             60000  # Increased to 60 seconds for slow connections
         )
         events = []
@@ -261,32 +474,45 @@ class SurfpoolEnv(gym.Env):
             events.extend(obs)
             return events, 0, False, False, error_info
 
-    async def step(self, tx):
+    async def step(self, tx, fetch_receipt: bool = True):
         """
         Executes a pre-signed transaction on the Solana network.
         This is the core function of the low-level environment.
         The transaction must be signed before being passed to this method.
+
+        With fetch_receipt=False the receipt is never fetched: success or failure comes from
+        the signature status alone, so no reward is scored and info has no tx_meta. Meant for
+        setup transactions where only the outcome matters.
         """
         self.last_tx_receipt = None
+        sig = None
         try:
             # The modern send_transaction expects a signed transaction
-            sig = await self.client.send_transaction(tx)
+            opts = TxOpts(skip_preflight=True, preflight_commitment=Processed) if self.skip_preflight else None
+            self._cached_blockhash = None   # see get_recent_blockhash
+            sig = await self.client.send_transaction(tx, opts=opts)
             
             # The commitment level for confirmation should be high enough
-            await self.client.confirm_transaction(sig.value, "confirmed", 30.0)
-            
-            # Fetch the confirmed transaction
-            result = await self.client.get_transaction(sig.value, commitment="confirmed")
-            
-            if not result or not result.value:
-                 raise Exception(f"Transaction result not found for signature {sig.value}")
+            status, = await self._wait_for_confirmation([sig.value], 30.0)
+
+            if not fetch_receipt:
+                result = None
+                last_tx_err = None if status.err is None else orjson.loads(status.to_json())["err"]
+            else:
+                # Fetch the confirmed transaction
+                result = await self.client.get_transaction(
+                    sig.value, commitment="confirmed", max_supported_transaction_version=0
+                )
+
+                if not result or not result.value:
+                     raise Exception(f"Transaction result not found for signature {sig.value}")
 
-            tx_receipt = result.value.transaction.to_json()
-            self.last_tx_receipt = tx_receipt
+                tx_meta, last_tx_err = self._decode_receipt(result)
 
         except Exception as e:
-            logging.error(f"Error sending transaction: {e}", exc_info=True)
-            obs = await self._get_observation()
+            self._log_expected_error(f"Error sending transaction: {e}")
+            # A transaction rejected at send (e.g. by preflight) never touched the chain
+            obs = await self._get_observation(refresh_chain=sig is not None)
             # Pass the error in the info dict
             return obs, 0, False, False, {"error": str(e)}
         except BaseException as e:
@@ -300,45 +526,146 @@ class SurfpoolEnv(gym.Env):
                 return obs, 0, False, False, {"error": str(e), "possible_success": True}
             return obs, 0, False, False, {"error": str(e)}
 
-        self.last_tx_receipt = tx_receipt
-        obs = await self._get_observation(last_tx_result=tx_receipt)
+        if result is None:
+            obs = await self._get_observation(last_tx_err=last_tx_err)
+            return obs, 0, False, False, {"tx_sig": str(sig.value), "reward": 0}
+
+        # Keep the native receipt; callers can to_json() it if they need the text
+        self.last_tx_receipt = result.value.transaction
+        obs = await self._get_observation(last_tx_err=last_tx_err)
         
         # Extract programs from this transaction for the info dict
         ordered_instructions = self._get_ordered_instructions(result)
         programs_in_tx = list({str(ix['program_id']) for ix in ordered_instructions})
         
-        reward = self._get_reward(result)
+        reward = self._get_reward(result, ordered_instructions)
         self.total_reward += reward
         return obs, reward, False, False, { 
             "tx_sig": str(sig.value), 
-            "tx_meta": result.value.to_json(),
+            "tx_meta": tx_meta,
             "programs_interacted": programs_in_tx,
             "reward": reward
         }
 
+    async def step_batch(self, txs: list[VersionedTransaction]):
+        """
+        Executes several pre-signed transactions, submitted together as one JSON-RPC batch.
+
+        The transactions are independent: one being rejected does not stop the others.
+        Returns the observation after the whole batch, the summed reward, and an info dict
+        whose "results" holds a step()-style info for each transaction, in order.
+        """
+        if not txs:
+            raise ValueError("step_batch needs at least one transaction")
+        self.last_tx_receipt = None
+        send_config = {
+            "encoding": "base64",
+            "skipPreflight": self.skip_preflight,
+            "preflightCommitment": "processed" if self.skip_preflight else "confirmed",
+        }
+        self._cached_blockhash = None   # see get_recent_blockhash
+        try:
+            sent = await self._batch_rpc(
+                [("sendTransaction", [base64.b64encode(bytes(tx)).decode(), send_config]) for tx in txs],
+                return_exceptions=True,
+            )
+        except Exception as e:
+            logging.error(f"Error sending transaction batch: {e}", exc_info=True)
+            obs = await self._get_observation()
+            return obs, 0, False, False, {"error": str(e)}
+
+        sigs = [Signature.from_string(sig) for sig in sent if not isinstance(sig, Exception)]
+        confirm_error = None
+        try:
+            await self._wait_for_confirmation(sigs, 30.0)
+        except Exception as e:
+            # Whatever did confirm is still scored below; the rest report this error
+            logging.error(f"Error confirming transaction batch: {e}")
+            confirm_error = e
+        receipts = iter(await asyncio.gather(
+            *(self.client.get_transaction(sig, commitment="confirmed", max_supported_transaction_version=0)
+              for sig in sigs),
+            return_exceptions=True,
+        ))
+
+        results = []
+        total = 0
+        last_tx_err = _NO_TX
+        for sig in sent:
+            if isinstance(sig, Exception):
+                results.append({"error": str(sig)})
+                continue
+            result = next(receipts)
+            if isinstance(result, Exception) or not result.value:
+                if isinstance(result, Exception):
+                    error = result
+                elif confirm_error is not None:
+                    error = confirm_error
+                else:
+                    error = f"Transaction result not found for signature {sig}"
+                results.append({"tx_sig": sig, "error": str(error)})
+                continue
+
+            try:
+                tx_meta, tx_err = self._decode_receipt(result)
+                ordered_instructions = self._get_ordered_instructions(result)
+                reward = self._get_reward(result, ordered_instructions)
+            except Exception as e:
+                self._log_expected_error(f"Error scoring transaction {sig}: {e}")
+                results.append({"tx_sig": sig, "error": str(e)})
+                continue
+            last_tx_err = tx_err
+            self.last_tx_receipt = result.value.transaction
+            total += reward
+            results.append({
+                "tx_sig": sig,
+                "tx_meta": tx_meta,
+                "programs_interacted": list({str(ix['program_id']) for ix in ordered_instructions}),
+                "reward": reward,
+            })
+
+        obs = await self._get_observation(last_tx_err=last_tx_err)
+        self.total_reward += total
+        return obs, total, False, False, {"results": results, "reward": total}
+
+    def _decode_receipt(self, result: GetTransactionResp):
+        """Returns the receipt's JSON text and its JSON-decoded meta.err (None on success)."""
+        tx_meta = result.value.to_json()
+        # Read the status straight off the solders object; only a failed
+        # transaction needs its JSON form to recover the error variant
+        last_tx_err = result.value.transaction.meta.err
+        if last_tx_err is not None:
+            # to_json() flattens the receipt, so meta sits next to slot and transaction
+            last_tx_err = orjson.loads(tx_meta)["meta"]["err"]
+        return tx_meta, last_tx_err
+
     def _get_ordered_instructions(self, tx_result: GetTransactionResp) -> list[dict[str, bytes]]:
         inner_instructions = {ix.index: ix.instructions for ix in tx_result.value.transaction.meta.inner_instructions}
         message = tx_result.value.transaction.transaction.message
+        # solders getters convert the whole Vec into a new Python list on every access,
+        # so read the account keys once instead of once per instruction
+        account_keys = message.account_keys
         ordered_instructions = []
         for idx, ix in enumerate(message.instructions):
             ordered_instructions.append({
-                'program_id': message.account_keys[ix.program_id_index],
+                'program_id': account_keys[ix.program_id_index],
                 'data': base58.b58decode(ix.data),
             })
             # pdb.set_trace()
             ordered_instructions.extend(
                 [{
-                    'program_id': message.account_keys[inner_instruction.program_id_index],
+                    'program_id': account_keys[inner_instruction.program_id_index],
                     'data': base58.b58decode(inner_instruction.data),
                 } for inner_instruction in inner_instructions[idx]]
             )
         return ordered_instructions
     
-    def _get_reward(self, tx_result: GetTransactionResp) -> float:
+    def _get_reward(self, tx_result: GetTransactionResp, ordered_instructions: list[dict[str, bytes]] = None) -> float:
         if tx_result.value.transaction.meta.err:
             return 0
 
-        ordered_instructions = self._get_ordered_instructions(tx_result)
+        if ordered_instructions is None:
+            ordered_instructions = self._get_ordered_instructions(tx_result)
 
         reward = 0
         for ix in ordered_instructions:
@@ -346,7 +673,8 @@ class SurfpoolEnv(gym.Env):
             if key not in self.program_instructions_seen:
                 reward += 1
                 self.program_instructions_seen[key] = True
-                logging.info(f"Discovered new program instruction ({str(key[0])}, {str(key[1])})")
+                self._discovered_programs.setdefault(str(key[0]), None)
+                logging.info("Discovered new program instruction (%s, %s)", key[0], key[1])
         return reward
     
     def render(self, mode="human"):
@@ -361,6 +689,7 @@ class SurfpoolEnv(gym.Env):
             if self.client:
                 await self.client.close()
             logging.info("SurfpoolEnv closed.")
+        await self._http.aclose()
         logging.info("SurfpoolEnv closed.")
 
     async def fetch_transactions(self, program_id: str = None):
@@ -469,12 +798,11 @@ if __name__ == '__main__':
         logging.info(f"Initial Observation: {obs}")
 
         async def make_tx(ixs, signers=[]):
-            latest_blockhash = await env.client.get_latest_blockhash()
             message = MessageV0.try_compile(
                 payer=env.agent_keypair.pubkey(),
                 instructions=ixs,
                 address_lookup_table_accounts=[],
-                recent_blockhash=latest_blockhash.value.blockhash
+                recent_blockhash=await env.get_recent_blockhash()
             )
             tx = VersionedTransaction(message, [env.agent_keypair] + signers)
             return tx
@@ -549,7 +877,7 @@ if __name__ == '__main__':
                 payer=env.agent_keypair.pubkey(),
                 instructions=[create_account_ix],
                 address_lookup_table_accounts=[],
-                recent_blockhash=(await env.client.get_latest_blockhash()).value.blockhash
+                recent_blockhash=await env.get_recent_blockhash()
             )
             
             # Create the transaction with these signatures
@@ -582,4 +910,4 @@ if __name__ == '__main__':
 
         await env.close()
 
-    asyncio.run(main())
+    asyncio.run(main(), loop_factory=event_loop_factory())
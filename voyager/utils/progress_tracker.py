@@ -14,11 +14,17 @@ class ProgressTracker:
     def __init__(self, ckpt_dir: str = "ckpt", resume: bool = False):
         self.ckpt_dir = ckpt_dir
         self.progress_file = os.path.join(ckpt_dir, "progress.csv")
-        self.messages_file = os.path.join(ckpt_dir, "agent_messages.json")
+        # One JSON object per line, appended as messages arrive
+        self.messages_file = os.path.join(ckpt_dir, "agent_messages.jsonl")
+        # Older checkpoints kept the whole log as a single JSON array
+        self.legacy_messages_file = os.path.join(ckpt_dir, "agent_messages.json")
         self.current_iteration = 0
         self.total_reward = 0
         self.completed_tasks = []
         self.messages_log = []
+        # Running counts behind the success rate, so summaries don't re-read the CSV
+        self._rows_recorded = 0
+        self._successes = 0
         
         # Ensure directory exists
         os.makedirs(ckpt_dir, exist_ok=True)
@@ -29,7 +35,8 @@ class ProgressTracker:
             self._init_progress_file()
     
     def _init_progress_file(self):
-        """Initialize CSV file with headers."""
+        """Initialize CSV file with headers and start an empty messages log."""
+        open(self.messages_file, 'w').close()
         with open(self.progress_file, 'w', newline='') as f:
             writer = csv.writer(f)
             writer.writerow([
@@ -53,6 +60,8 @@ class ProgressTracker:
             with open(self.progress_file, 'r') as f:
                 reader = csv.DictReader(f)
                 rows = list(reader)
+                self._rows_recorded = len(rows)
+                self._successes = sum(1 for row in rows if row['task_success'] == 'True')
                 if rows:
                     last_row = rows[-1]
                     self.current_iteration = int(last_row['iteration'])
@@ -62,7 +71,14 @@ class ProgressTracker:
             # Load messages log
             if os.path.exists(self.messages_file):
                 with open(self.messages_file, 'r') as f:
+                    self.messages_log = [json.loads(line) for line in f if line.strip()]
+            elif os.path.exists(self.legacy_messages_file):
+                with open(self.legacy_messages_file, 'r') as f:
                     self.messages_log = json.load(f)
+                # Carry the history over so new messages are appended after it
+                with open(self.messages_file, 'w') as f:
+                    for entry in self.messages_log:
+                        f.write(json.dumps(entry) + "\n")
         except Exception as e:
             logging.error(f"Error loading existing progress: {e}")
     
@@ -79,6 +95,9 @@ class ProgressTracker:
         """Record a single iteration's results."""
         self.current_iteration += 1
         self.total_reward += reward
+        self._rows_recorded += 1
+        if success:
+            self._successes += 1
         
         if completed_tasks:
             self.completed_tasks = completed_tasks
@@ -130,9 +149,9 @@ class ProgressTracker:
         
         self.messages_log.append(message_entry)
         
-        # Save to JSON file
-        with open(self.messages_file, 'w') as f:
-            json.dump(self.messages_log, f, indent=2)
+        # Append just this message rather than rewriting the whole log
+        with open(self.messages_file, 'a') as f:
+            f.write(json.dumps(message_entry) + "\n")
     
     def get_summary(self) -> Dict[str, Any]:
         """Get a summary of current progress."""
@@ -145,18 +164,10 @@ class ProgressTracker:
         }
     
     def _calculate_success_rate(self) -> float:
-        """Calculate success rate from CSV file."""
-        try:
-            with open(self.progress_file, 'r') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-                if not rows:
-                    return 0.0
-                
-                successes = sum(1 for row in rows if row['task_success'] == 'True')
-                return successes / len(rows) * 100
-        except:
+        """Calculate success rate over all recorded iterations."""
+        if not self._rows_recorded:
             return 0.0
+        return self._successes / self._rows_recorded * 100
     
     def export_summary_report(self):
         """Export a summary report of the run."""
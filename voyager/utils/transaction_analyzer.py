@@ -1,8 +1,10 @@
-import json
 import os
-from typing import Dict, List, Any
-from datetime import datetime
-import pandas as pd
+import orjson
+from typing import TYPE_CHECKING, Dict, List, Any
+
+if TYPE_CHECKING:
+    # pandas is only needed for the summary table; import it lazily there.
+    import pandas as pd
 
 
 class TransactionAnalyzer:
@@ -13,38 +15,74 @@ class TransactionAnalyzer:
     def __init__(self, ckpt_dir: str):
         self.ckpt_dir = ckpt_dir
         self.events_dir = os.path.join(ckpt_dir, "events")
-        
-    def load_all_transactions(self) -> List[Dict[str, Any]]:
-        """Load all transaction data from event files."""
-        transactions = []
-        
+        self._transactions: List[Dict[str, Any]] = []
+        self._events_fingerprint = None
+        # filename -> ((mtime_ns, size), parsed entries for that file)
+        self._file_cache: Dict[str, tuple] = {}
+
+    def _fingerprint_events(self) -> tuple:
+        """Cheap (name, mtime, size) snapshot of the events directory."""
         if not os.path.exists(self.events_dir):
-            return transactions
-            
+            return ()
+        fingerprint = []
         for filename in sorted(os.listdir(self.events_dir)):
-            filepath = os.path.join(self.events_dir, filename)
-            try:
-                with open(filepath, 'r') as f:
-                    events = json.load(f)
-                    
-                for event_type, event_data in events:
-                    if event_type == "info" and "tx_meta" in event_data:
-                        tx_entry = {
-                            "task": filename,
-                            "signature": event_data.get("tx_sig"),
-                            "programs": event_data.get("programs_interacted", []),
-                            "reward": event_data.get("reward", 0),
-                            "metadata": json.loads(event_data["tx_meta"])
-                        }
-                        transactions.append(tx_entry)
-                        
-            except Exception as e:
-                print(f"Error loading {filename}: {e}")
-                
+            st = os.stat(os.path.join(self.events_dir, filename))
+            fingerprint.append((filename, st.st_mtime_ns, st.st_size))
+        return tuple(fingerprint)
+
+    def _load_event_file(self, filename: str) -> List[Dict[str, Any]]:
+        """Parse the transactions recorded in a single event file."""
+        entries = []
+        filepath = os.path.join(self.events_dir, filename)
+        try:
+            with open(filepath, 'rb') as f:
+                events = orjson.loads(f.read())
+
+            for event_type, event_data in events:
+                if event_type == "info" and "tx_meta" in event_data:
+                    entries.append({
+                        "task": filename,
+                        "signature": event_data.get("tx_sig"),
+                        "programs": event_data.get("programs_interacted", []),
+                        "reward": event_data.get("reward", 0),
+                        "metadata": orjson.loads(event_data["tx_meta"])
+                    })
+
+        except Exception as e:
+            print(f"Error loading {filename}: {e}")
+        return entries
+
+    def load_all_transactions(self) -> List[Dict[str, Any]]:
+        """Load all transaction data from event files.
+
+        The parsed result is cached until the events directory changes, so the
+        summary, stats and export reports share a single pass over the files.
+        When it does change, only new or modified event files are re-parsed.
+        """
+        fingerprint = self._fingerprint_events()
+        if fingerprint == self._events_fingerprint:
+            return self._transactions
+
+        file_cache = {}
+        transactions = []
+        for filename, mtime_ns, size in fingerprint:
+            cached = self._file_cache.get(filename)
+            if cached is not None and cached[0] == (mtime_ns, size):
+                entries = cached[1]
+            else:
+                entries = self._load_event_file(filename)
+            file_cache[filename] = ((mtime_ns, size), entries)
+            transactions.extend(entries)
+
+        self._file_cache = file_cache
+        self._transactions = transactions
+        self._events_fingerprint = fingerprint
         return transactions
     
-    def get_transaction_summary(self) -> pd.DataFrame:
+    def get_transaction_summary(self) -> "pd.DataFrame":
         """Create a summary DataFrame of all transactions."""
+        import pandas as pd
+
         transactions = self.load_all_transactions()
         
         summary_data = []
@@ -93,8 +131,8 @@ class TransactionAnalyzer:
         transactions = self.load_all_transactions()
         
         output_path = os.path.join(self.ckpt_dir, output_file)
-        with open(output_path, 'w') as f:
-            json.dump(transactions, f, indent=2)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(transactions, option=orjson.OPT_INDENT_2))
             
         print(f"Exported {len(transactions)} transactions to {output_path}")
         
@@ -103,13 +141,17 @@ class TransactionAnalyzer:
         transactions = self.load_all_transactions()
         
         total_txs = len(transactions)
-        successful_txs = sum(1 for tx in transactions if tx["metadata"]["meta"]["err"] is None)
-        total_rewards = sum(tx["reward"] for tx in transactions)
+        successful_txs = 0
+        total_rewards = 0
         unique_programs = set()
-        
+
+        # One pass over the transactions for all aggregates
         for tx in transactions:
+            if tx["metadata"]["meta"]["err"] is None:
+                successful_txs += 1
+            total_rewards += tx["reward"]
             unique_programs.update(tx["programs"])
-            
+
         print(f"\n📊 Transaction Statistics:")
         print(f"Total transactions: {total_txs}")
         print(f"Successful transactions: {successful_txs} ({successful_txs/total_txs*100:.1f}%)")
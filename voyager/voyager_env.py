@@ -253,11 +253,10 @@ class SolanaVoyagerEnv(gym.Env):
             # Pass agent pubkey and latest blockhash to skill execution
             agent_pubkey = str(self.solana_env.agent_keypair.pubkey())
             
-            # Fetch latest blockhash before skill execution
-            blockhash_resp = await self.solana_env.client.get_latest_blockhash()
-            latest_blockhash_str = str(blockhash_resp.value.blockhash)
+            # Fetch latest blockhash before skill execution; it is reused to sign below
+            latest_blockhash = await self.solana_env.get_recent_blockhash()
             
-            result = self.skills.execute_skill(file_path, agent_pubkey=agent_pubkey, latest_blockhash=latest_blockhash_str)
+            result = self.skills.execute_skill(file_path, agent_pubkey=agent_pubkey, latest_blockhash=str(latest_blockhash))
             
             # Get transaction data from skill result
             # Note: tx_receipt_json_string is now a base64-encoded unsigned transaction
@@ -278,10 +277,7 @@ class SolanaVoyagerEnv(gym.Env):
                 tx_bytes = base64.b64decode(tx_data)
                 tx = Transaction.from_bytes(tx_bytes)
                 
-                # Sign with agent keypair
-                # Fetch the latest blockhash from surfpool
-                blockhash_resp = await self.solana_env.client.get_latest_blockhash()
-                latest_blockhash = blockhash_resp.value.blockhash
+                # Sign with agent keypair, using the blockhash the skill was built with
                 pdb.set_trace()
                 
                 tx.sign([self.solana_env.agent_keypair], latest_blockhash)
@@ -352,6 +348,7 @@ class SolanaVoyagerEnv(gym.Env):
         return self.solana_env.render(mode=mode)
 
     async def close(self):
+        self.skills.close()
         await self.solana_env.close()
         if hasattr(self, 'tx_fetch_client'):
             await self.tx_fetch_client.close()